@@ -1,8 +1,7 @@
 # src/siliv/app.py
 # Manages the menu bar icon and VRAM logic using PyQt6.
 
-import platform
-import math # Needed for rounding/snapping
+import time
 
 # PyQt6 Imports
 from PyQt6.QtWidgets import (
@@ -10,7 +9,7 @@ from PyQt6.QtWidgets import (
     QWidgetAction
 )
 # Import QSettings
-from PyQt6.QtCore import Qt, QTimer, QObject, pyqtSignal, QSettings
+from PyQt6.QtCore import Qt, QTimer, QObject, QThread, QProcess, QSignalBlocker, pyqtSignal, pyqtSlot, QSettings
 from PyQt6.QtGui import QIcon, QCursor, QAction
 
 # Local Imports
@@ -24,12 +23,69 @@ APPLICATION_NAME = "Siliv"
 SAVED_VRAM_KEY = "user/savedVramMb"
 # --------------------------
 
+_MB_TO_GB = 1 / 1024.0
+_ACTIVATION_DEBOUNCE_S = 0.1 # Tray activations closer together than this count as one click
+
+# --- Preset Constants ---
+# Standard preset points in GB (sorted) and the labels assigned to them in order
+# (fallback "<N> GB" label used once these run out)
+_PRESET_GBS = (4, 6, 8, 12, 16, 24, 32, 48, 64, 96, 128, 256, 512)
+_PRESET_LABELS = ("Basic", "Balanced", "More", "Gaming", "High", "Very High", "Extreme", "Insane")
+# ------------------------
+
+_BOLD_FONT = None # Shared bold font, created on first use (needs a QApplication)
+
+def _bold_font():
+    """Returns the shared bold variant of the application font."""
+    global _BOLD_FONT
+    if _BOLD_FONT is None:
+        _BOLD_FONT = QApplication.font()
+        _BOLD_FONT.setBold(True)
+    return _BOLD_FONT
+
+# --- Menu Text Templates ---
+_RESERVED_RAM_FMT = "Reserved System RAM: {:.1f} GB"
+_ALLOCATED_VRAM_FMT = "Allocated VRAM: {:.1f} GB ({} MB)"
+# ---------------------------
+
+class SettingsWriter(QObject):
+    """Persists settings on a worker thread so plist flushes never block the UI."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._settings = None # Created lazily in the worker thread
+
+    @pyqtSlot(str, int)
+    def write(self, key, value):
+        """Writes a single value. Qt flushes it to disk periodically; see flush."""
+        if self._settings is None:
+            self._settings = QSettings(ORGANIZATION_NAME, APPLICATION_NAME)
+        self._settings.setValue(key, value)
+
+    @pyqtSlot()
+    def flush(self):
+        """Syncs this thread's QSettings to disk (called blocking on quit)."""
+        if self._settings is not None:
+            self._settings.sync()
+
+class VramReader(QObject):
+    """Reads the current VRAM limit on the worker thread so a slow sysctl never delays the menu."""
+    valuesReady = pyqtSignal(int, int) # (current_vram_mb, total_ram_mb)
+
+    @pyqtSlot(int)
+    def read(self, total_ram_mb):
+        self.valuesReady.emit(utils.get_current_vram_mb(total_ram_mb), total_ram_mb)
+
 class MenuBarApp(QObject):
+    saveVramRequested = pyqtSignal(str, int)
+    flushSettingsRequested = pyqtSignal()
+    readVramRequested = pyqtSignal(int)
+
     def __init__(self, icon_path, parent=None):
         super().__init__(parent)
         # --- State Variables ---
         self.total_ram_mb = 0
         self.current_vram_mb = 0
+        self._initial_vram_mb = 0 # VRAM from the combined startup read in perform_initial_checks
         self.reserved_ram_mb = 0
         self.target_vram_mb = 0 # Represents the value the slider/user wants
         self.macos_major_version = 0
@@ -38,6 +94,9 @@ class MenuBarApp(QObject):
         self.max_vram_mb = config.SLIDER_MIN_MB # Will be calculated
         self.is_operational = False
         self.preset_list_cache = []
+        self._calculated_default_mb = 0 # Cached macOS default VRAM (total RAM never changes)
+        self._total_ram_gb = 0.0
+        self._total_ram_text = "Total System RAM: ..." # Formatted once total RAM is known
 
         # --- UI Widget/Action References ---
         # ... (UI references remain the same) ...
@@ -50,24 +109,58 @@ class MenuBarApp(QObject):
         self.allocated_vram_info_action = None
         self.default_action = None
         self.presets_menu = None
-        self.preset_actions = {}
+        self.preset_actions = {} # mb -> (QAction, base_text)
+        self._preset_operational = None # is_operational the preset actions were last rendered for
+        self._preset_current_mb = None  # Preset currently marked "(Current)", if any
+        self._menu_update_pending = False # A coalesced update_menu_items is queued
+        self._menu_dirty = True # VRAM may have changed since the last read (e.g. after an apply)
+        self._last_refresh_ts = 0.0 # time.monotonic() of the last VRAM read
+        self._vram_read_pending = False # A background VramReader.read is in flight
+        self._follow_target_on_read = False # Pending read should move an untouched target along
+        self._last_activation_ts = 0.0 # time.monotonic() of the last accepted tray activation
+        self._default_base_text = "Allocate Default VRAM"
+        self._last_rendered = None # (total_ram_mb, current_vram_mb, target_vram_mb, is_operational) last shown
+        self._last_labelled_vram = -1 # current_vram_mb the reserved/allocated labels were formatted for
         self.custom_vram_title_action = None
         self.slider_widget = None
         self.slider_widget_action = None
         self.slider_value_action = None # The "Apply X GB" action
         self.refresh_action = None
         self.quit_action = None
+        self._vram_process = None # Running osascript QProcess while an apply is in flight
+        self._vram_process_mb = 0 # Value that process is applying
 
         # --- Application Setup ---
         self.app = QApplication.instance()
         self.settings = QSettings(ORGANIZATION_NAME, APPLICATION_NAME)
+        # In-memory copy of the saved VRAM, used for startup apply and to skip no-op writes.
+        # contains() distinguishes a missing key from a saved value of 0
+        self._cached_saved_vram = None
+        if self.settings.contains(SAVED_VRAM_KEY):
+            try:
+                self._cached_saved_vram = self.settings.value(SAVED_VRAM_KEY, defaultValue=None, type=int)
+            except TypeError:
+                print(f"[Startup Apply] Warning: Could not parse saved VRAM value '{self.settings.value(SAVED_VRAM_KEY)}'. Ignoring.")
+
+        # --- Worker Thread (settings writes, background VRAM reads) ---
+        self._worker_thread = QThread(self)
+        self._writer = SettingsWriter()
+        self._writer.moveToThread(self._worker_thread)
+        self.saveVramRequested.connect(self._writer.write, Qt.ConnectionType.QueuedConnection)
+        # Blocking: quit_app waits until every write queued before it has been synced
+        self.flushSettingsRequested.connect(self._writer.flush, Qt.ConnectionType.BlockingQueuedConnection)
+        self._reader = VramReader()
+        self._reader.moveToThread(self._worker_thread)
+        self.readVramRequested.connect(self._reader.read, Qt.ConnectionType.QueuedConnection)
+        self._reader.valuesReady.connect(self._apply_vram_values, Qt.ConnectionType.QueuedConnection)
+        self._worker_thread.start()
 
         self.is_operational = self.perform_initial_checks()
         if not self.is_operational:
             print("App is not operational due to failed initial checks.")
 
         if self.total_ram_mb > 0:
-             self.update_ram_values()
+             self._store_vram_value(self._initial_vram_mb)
              self.target_vram_mb = self.current_vram_mb
              # --- Calculate slider range BEFORE creating menu actions ---
              self.calculate_slider_range()
@@ -87,7 +180,7 @@ class MenuBarApp(QObject):
 
         # --- Menu ---
         self.menu = QMenu()
-        self.create_menu_actions() # Creates actions and connects signals
+        self._build_static_menu() # Creates actions and connects signals (once)
 
         if self.total_ram_mb > 0:
             self.tray_icon.show()
@@ -95,42 +188,76 @@ class MenuBarApp(QObject):
         else:
             print("[App] Tray icon not shown due to critical initialization failure.")
 
-        self.update_menu_items()
+        self.update_menu_items(force=True)
+
+        # --- Refresh Timer ---
+        self.refresh_timer = QTimer(self)
+        # Coarse timers avoid raising the system timer resolution (wake-ups / battery);
+        # whole-second accuracy is plenty for a 2 s poll
+        self.refresh_timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
+        self.refresh_timer.setInterval(config.REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self._refresh_data_and_update_menu, Qt.ConnectionType.QueuedConnection)
+        # Not started here: it only runs while the menu is open (see aboutToShow/aboutToHide)
+
+        # --- Background Watchdog (picks up changes made outside Siliv) ---
+        self._watchdog_timer = QTimer(self)
+        self._watchdog_timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
+        self._watchdog_timer.timeout.connect(self._refresh_data_and_update_menu, Qt.ConnectionType.QueuedConnection)
+        self._watchdog_timer.start(config.WATCHDOG_INTERVAL_MS)
+
+        # --- Post-Apply Refresh (stoppable on quit, unlike a static singleShot) ---
+        self._post_apply_timer = QTimer(self)
+        self._post_apply_timer.setSingleShot(True)
+        self._post_apply_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._post_apply_timer.timeout.connect(self._refresh_data_and_update_menu, Qt.ConnectionType.QueuedConnection)
+
+        # --- Slider Update Coalescing (~60 Hz) ---
+        self._slider_coalesce = QTimer(self)
+        self._slider_coalesce.setSingleShot(True)
+        self._slider_coalesce.setInterval(16)
+        self._slider_coalesce.setTimerType(Qt.TimerType.CoarseTimer)
+        self._slider_coalesce.timeout.connect(self.update_menu_items)
+
+        # Poll only while the menu is open
+        self.menu.aboutToShow.connect(self._on_menu_about_to_show)
+        self.menu.aboutToHide.connect(self._on_menu_about_to_hide)
+
+        # Stop polling entirely while the app is hidden / suspended
+        self.app.applicationStateChanged.connect(self._on_app_state)
 
         # --- Apply Saved VRAM on Startup ---
+        # Deferred until the event loop runs so the tray icon appears first
         if self.total_ram_mb > 0:
-            self.apply_saved_vram_on_startup()
+            QTimer.singleShot(0, self.apply_saved_vram_on_startup)
         # ---------------------------------
 
-        # --- Refresh Timer ---
-        self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self._refresh_data_and_update_menu)
-        self.refresh_timer.start(config.REFRESH_INTERVAL_MS)
-
     # --- Methods for setup, checks, calculations ---
 
     def perform_initial_checks(self):
         """Checks OS compatibility, retrieves RAM, and finds VRAM key."""
         print("Performing initial checks...")
-        if platform.system() != "Darwin":
+        if not utils.IS_DARWIN:
             self._show_error("Compatibility Error", "Siliv requires macOS.")
             return False
 
-        self.macos_major_version = utils.get_macos_version()
+        # One combined read; __init__ stores the VRAM value instead of reading it again
+        self.total_ram_mb, self._initial_vram_mb = utils.get_system_state()
+        _, self.vram_key, self.macos_major_version = utils.get_static_sysinfo()
         if self.macos_major_version == 0:
             self._show_error("Error", "Could not determine macOS version.")
         else:
             print(f"Detected macOS Version: {self.macos_major_version}")
 
-        self.vram_key = utils.get_vram_sysctl_key()
         can_set_vram = self.vram_key is not None
 
-        self.total_ram_mb = utils.get_total_ram_mb()
         if not self.total_ram_mb or self.total_ram_mb <= 0:
             self._show_error("Error", "Could not retrieve total system RAM.\nApplication cannot function correctly.")
             return False # This is critical
 
         print(f"Total System RAM: {self.total_ram_mb} MB")
+        self._calculated_default_mb = utils.calculate_default_vram_mb(self.total_ram_mb)
+        self._total_ram_gb = self.total_ram_mb * _MB_TO_GB
+        self._total_ram_text = f"Total System RAM: {self._total_ram_gb:.1f} GB"
 
         if not can_set_vram:
             self._show_warning("Unsupported OS or Permissions", f"macOS {self.macos_major_version} might not support VRAM control with this tool, or permissions are insufficient.\nFunctionality will be limited to displaying information.")
@@ -173,7 +300,7 @@ class MenuBarApp(QObject):
         Generates a list of sensible VRAM presets in GB tuples (GB, Label).
         Includes standard presets and 1GB increments near the maximum.
         """
-        presets = []
+        presets = {} # gb -> (gb, label); dict keys give O(1) de-duplication
         if not self.total_ram_mb or self.max_vram_mb <= self.min_vram_mb:
             print("[Presets] Cannot generate presets: Invalid RAM or VRAM range.")
             return []
@@ -181,30 +308,27 @@ class MenuBarApp(QObject):
         # Use calculated max allocatable VRAM based on reserve config
         max_preset_mb = self.max_vram_mb
         # Calculate the theoretical macOS default for comparison
-        calculated_default_mb = utils.calculate_default_vram_mb(self.total_ram_mb)
+        calculated_default_mb = self._calculated_default_mb
+        min_vram_mb = self.min_vram_mb
 
-        print(f"[Presets] Max allocatable MB: {max_preset_mb}, Calculated default MB: {calculated_default_mb}, Min allowed MB: {self.min_vram_mb}")
+        print(f"[Presets] Max allocatable MB: {max_preset_mb}, Calculated default MB: {calculated_default_mb}, Min allowed MB: {min_vram_mb}")
 
         # --- Standard Presets ---
-        # Added 256 and 512 here
-        potential_gbs = [4, 6, 8, 12, 16, 24, 32, 48, 64, 96, 128, 256, 512] # Base points
-        labels = ["Basic", "Balanced", "More", "Gaming", "High", "Very High", "Extreme", "Insane"] # Labels for standard points (fallback used for higher values)
+        labels = _PRESET_LABELS
+        num_labels = len(labels)
         label_idx = 0
-        added_gbs = set() # Keep track of GB values added
 
-        for gb in potential_gbs:
+        for gb in _PRESET_GBS:
             mb = gb * 1024
             # Check if within valid range AND significantly different from default
-            if self.min_vram_mb <= mb <= max_preset_mb and abs(mb - calculated_default_mb) > 1024:
-                if gb not in added_gbs:
-                    # Assign labels sequentially or use GB value as fallback
-                    label = labels[label_idx] if label_idx < len(labels) else f"{gb} GB"
-                    presets.append((gb, label))
-                    added_gbs.add(gb)
-                    # Only increment label_idx if we actually used a label from the list
-                    if label_idx < len(labels):
-                         label_idx += 1
-        print(f"[Presets] After standard points: {presets}")
+            if min_vram_mb <= mb <= max_preset_mb and abs(mb - calculated_default_mb) > 1024:
+                # Assign labels sequentially or use GB value as fallback
+                label = labels[label_idx] if label_idx < num_labels else f"{gb} GB"
+                presets[gb] = (gb, label)
+                # Only increment label_idx if we actually used a label from the list
+                if label_idx < num_labels:
+                     label_idx += 1
+        print(f"[Presets] After standard points: {list(presets.values())}")
 
         # --- Near-Maximum 1GB Increment Presets ---
         max_alloc_gb = int(max_preset_mb / 1024) # The highest whole GB possible
@@ -217,25 +341,28 @@ class MenuBarApp(QObject):
 
             mb = gb * 1024
             # Check conditions: within range, not too close to default, and not already added
-            if gb not in added_gbs and self.min_vram_mb <= mb <= max_preset_mb and abs(mb - calculated_default_mb) > 1024:
+            if gb not in presets and min_vram_mb <= mb <= max_preset_mb and abs(mb - calculated_default_mb) > 1024:
                  print(f"[Presets] Adding near-max preset: {gb} GB")
-                 presets.append((gb, f"{gb} GB")) # Use simple label for these
-                 added_gbs.add(gb)
+                 presets[gb] = (gb, f"{gb} GB") # Use simple label for these
 
-        # --- Final Sort ---
-        presets.sort(key=lambda x: x[0]) # Sort all presets by GB value
-        print(f"[Presets] Final generated list: {presets}")
-        return presets
+        # Near-max GBs can fall between standard points, so one final sort is still needed.
+        # Tuples sort by GB first (GB values are unique, so labels are never compared)
+        preset_list = sorted(presets.values())
+        print(f"[Presets] Final generated list: {preset_list}")
+        return preset_list
     # --- END PRESET MODIFICATION ---
 
-    def create_menu_actions(self):
-        """Creates and adds actions and widgets to the menu."""
-        self.menu.clear()
-        self.preset_actions.clear()
+    def _build_static_menu(self):
+        """Creates and adds actions and widgets to the menu.
+
+        The menu structure is built exactly once; afterwards only text and
+        enabled state change, via _refresh_dynamic_menu.
+        """
+        assert self.app_name_action is None, "_build_static_menu must only be called once"
 
         # --- App Title ---
         self.app_name_action = QAction("Siliv VRAM Tool")
-        font = self.app_name_action.font(); font.setBold(True); self.app_name_action.setFont(font)
+        self.app_name_action.setFont(_bold_font())
         self.app_name_action.setEnabled(False)
         self.menu.addAction(self.app_name_action)
         self.menu.addSeparator()
@@ -250,7 +377,7 @@ class MenuBarApp(QObject):
         self.ram_vram_bar_widget_action.setDefaultWidget(self.ram_vram_bar_widget)
         self.menu.addAction(self.ram_vram_bar_widget_action)
 
-        self.total_ram_info_action = QAction("Total System RAM: ...")
+        self.total_ram_info_action = QAction(self._total_ram_text) # Constant, never updated
         self.total_ram_info_action.setEnabled(False)
         self.menu.addAction(self.total_ram_info_action)
         self.reserved_ram_info_action = QAction("Reserved System RAM: ...")
@@ -262,7 +389,7 @@ class MenuBarApp(QObject):
         self.menu.addSeparator()
 
         # --- Control Actions ---
-        self.default_action = QAction("Allocate Default VRAM")
+        self.default_action = QAction(self._default_base_text)
         self.default_action.triggered.connect(self.set_default_vram)
         self.default_action.setEnabled(self.is_operational)
         self.menu.addAction(self.default_action)
@@ -270,17 +397,12 @@ class MenuBarApp(QObject):
         self.presets_menu = self.menu.addMenu("Presets")
         self.presets_menu.setEnabled(self.is_operational and bool(self.preset_list_cache))
         if not self.preset_list_cache:
-            no_presets_action = QAction("No presets available")
+            no_presets_action = QAction("No presets available", self.presets_menu) # Parented: owned by the submenu
             no_presets_action.setEnabled(False)
             self.presets_menu.addAction(no_presets_action)
         else:
-            for gb, label_suffix in self.preset_list_cache:
-                mb = gb * 1024
-                action = QAction(f"Allocate {gb} GB VRAM ({label_suffix})")
-                action.triggered.connect(lambda checked=False, m=mb: self.set_preset_vram(m))
-                action.setEnabled(self.is_operational)
-                self.presets_menu.addAction(action)
-                self.preset_actions[mb] = action
+            # Preset actions are built on first open of the submenu
+            self.presets_menu.aboutToShow.connect(self._populate_presets_menu)
 
         self.menu.addSeparator()
 
@@ -319,12 +441,59 @@ class MenuBarApp(QObject):
         self.quit_action.triggered.connect(self.quit_app)
         self.menu.addAction(self.quit_action)
 
+    def _populate_presets_menu(self):
+        """Creates the preset actions the first time the Presets submenu is opened."""
+        if self.preset_actions: return
+
+        for gb, label_suffix in self.preset_list_cache:
+            mb = gb * 1024
+            base_text = f"Allocate {gb} GB VRAM ({label_suffix})"
+            action = QAction(base_text, self.presets_menu) # Parented so Qt owns and frees it with the submenu
+            action.setData(mb)
+            action.triggered.connect(self._on_preset_triggered)
+            self.presets_menu.addAction(action)
+            self.preset_actions[mb] = (action, base_text) # Base label kept to avoid re-parsing text
+
+        # Built for good, later opens don't need this slot at all
+        self.presets_menu.aboutToShow.disconnect(self._populate_presets_menu)
+        self._update_preset_actions()
+
+    def _update_preset_actions(self):
+        """Updates the enabled state and (Current) marker of the built preset actions.
+
+        Only a change of is_operational touches every action; a VRAM change
+        re-renders at most the previously and the newly current preset.
+        """
+        if not self.preset_actions: return
+
+        new_current_mb = self.current_vram_mb if self.current_vram_mb in self.preset_actions else None
+        if self._preset_operational != self.is_operational:
+            changed_mbs = self.preset_actions.keys()
+        elif new_current_mb != self._preset_current_mb:
+            changed_mbs = [mb for mb in (self._preset_current_mb, new_current_mb) if mb is not None]
+        else:
+            return # Already showing this state
+
+        for mb_key in changed_mbs:
+            action, base_text = self.preset_actions[mb_key]
+            is_current_preset = (mb_key == new_current_mb)
+            action.setEnabled(self.is_operational and not is_current_preset)
+            action.setText(base_text + (" (Current)" if is_current_preset else ""))
+
+        self._preset_operational = self.is_operational
+        self._preset_current_mb = new_current_mb
+
     def update_ram_values(self):
         """Fetches current VRAM using utils, recalculates reserved RAM. Returns True if VRAM changed."""
         if self.total_ram_mb <= 0: return False
+        return self._store_vram_value(utils.get_current_vram_mb(self.total_ram_mb))
 
+    def _store_vram_value(self, vram_mb):
+        """Stores a freshly read VRAM value and recalculates reserved RAM. Returns True if VRAM changed."""
         old_vram = self.current_vram_mb
-        self.current_vram_mb = utils.get_current_vram_mb(self.total_ram_mb)
+        self.current_vram_mb = vram_mb
+        self._menu_dirty = False
+        self._last_refresh_ts = time.monotonic()
 
         if self.current_vram_mb > self.total_ram_mb:
             print(f"Warning: Reported current VRAM ({self.current_vram_mb}MB) exceeds total RAM ({self.total_ram_mb}MB). Clamping to total RAM.")
@@ -339,8 +508,12 @@ class MenuBarApp(QObject):
 
         return vram_changed
 
-    def update_menu_items(self):
-        """Updates the text and enabled state of all menu items based on current state."""
+    def update_menu_items(self, force=False):
+        """Updates the text and enabled state of all menu items based on current state.
+
+        Skips the update when nothing observable changed since the last render,
+        unless force is True (e.g. right after the menu actions were created).
+        """
         if self.total_ram_mb <= 0:
             print("Cannot update menu items: Total RAM unknown.")
             if self.default_action: self.default_action.setEnabled(False)
@@ -349,65 +522,117 @@ class MenuBarApp(QObject):
             if self.slider_value_action: self.slider_value_action.setEnabled(False)
             return
 
-        if self.ram_vram_bar_widget:
-            self.ram_vram_bar_widget.update_values(self.total_ram_mb, self.current_vram_mb, self.target_vram_mb)
+        state = (self.total_ram_mb, self.current_vram_mb, self.target_vram_mb, self.is_operational)
+        if state == self._last_rendered and not force:
+            return
+
+        self._refresh_dynamic_menu()
+        self._last_rendered = state
 
-        total_ram_gb = self.total_ram_mb / 1024.0
-        current_vram_gb = self.current_vram_mb / 1024.0
-        current_reserved_ram_gb = (self.total_ram_mb - self.current_vram_mb) / 1024.0
+    def _refresh_dynamic_menu(self):
+        """Updates text and enabled state of the existing menu items (never rebuilds)."""
+        # The info labels only depend on the current VRAM (total RAM is fixed)
+        if self.current_vram_mb != self._last_labelled_vram:
+            current_vram_gb = self.current_vram_mb * _MB_TO_GB
+            current_reserved_ram_gb = self._total_ram_gb - current_vram_gb
 
-        if self.total_ram_info_action: self.total_ram_info_action.setText(f"Total System RAM: {total_ram_gb:.1f} GB")
-        if self.reserved_ram_info_action: self.reserved_ram_info_action.setText(f"Reserved System RAM: {current_reserved_ram_gb:.1f} GB")
-        if self.allocated_vram_info_action: self.allocated_vram_info_action.setText(f"Allocated VRAM: {current_vram_gb:.1f} GB ({self.current_vram_mb} MB)")
+            if self.reserved_ram_info_action: self.reserved_ram_info_action.setText(_RESERVED_RAM_FMT.format(current_reserved_ram_gb))
+            if self.allocated_vram_info_action: self.allocated_vram_info_action.setText(_ALLOCATED_VRAM_FMT.format(current_vram_gb, self.current_vram_mb))
+            self._last_labelled_vram = self.current_vram_mb
 
-        calculated_default_mb = utils.calculate_default_vram_mb(self.total_ram_mb)
-        is_current_default = (self.current_vram_mb == calculated_default_mb)
+        is_current_default = (self.current_vram_mb == self._calculated_default_mb)
 
         if self.default_action:
+            self.default_action.setText(self._default_base_text + (" (Current)" if is_current_default else ""))
             self.default_action.setEnabled(self.is_operational and not is_current_default)
-            self.default_action.setText(f"Allocate Default VRAM{' (Current)' if is_current_default else ''}")
 
         if self.presets_menu:
-            self.presets_menu.setEnabled(self.is_operational and bool(self.preset_actions))
-            for mb_key, action in self.preset_actions.items():
-                is_current_preset = (self.current_vram_mb == mb_key)
-                action.setEnabled(self.is_operational and not is_current_preset)
-                original_text = action.text().split(" (Current)")[0]
-                action.setText(f"{original_text}{' (Current)' if is_current_preset else ''}")
+            self.presets_menu.setEnabled(self.is_operational and bool(self.preset_list_cache))
+            self._update_preset_actions()
 
         if self.slider_widget:
              self.slider_widget.setEnabled(self.is_operational)
              if self.is_operational:
-                 self.slider_widget.set_value(self.target_vram_mb)
+                 # Programmatic move, must not loop back into handle_slider_value_changed
+                 with QSignalBlocker(self.slider_widget):
+                     self.slider_widget.set_value(self.target_vram_mb)
+
+        self._sync_target_ui()
+
+    def _schedule_menu_update(self):
+        """Queues a menu update; multiple requests in one event-loop turn coalesce into one."""
+        if self._menu_update_pending: return
+        self._menu_update_pending = True
+        QTimer.singleShot(0, self._do_menu_update)
+
+    def _do_menu_update(self):
+        """Runs the menu update queued by _schedule_menu_update."""
+        self._menu_update_pending = False
+        self.update_menu_items()
+
+    def _sync_target_ui(self):
+        """Updates the bar widget and the slider apply action to reflect target_vram_mb.
+
+        Only part of the menu follows the target here (the slider itself may not),
+        so the render snapshot is dropped and the next update_menu_items re-renders.
+        """
+        self._last_rendered = None
+        if self.ram_vram_bar_widget:
+            self.ram_vram_bar_widget.update_values(self.total_ram_mb, self.current_vram_mb, self.target_vram_mb)
 
         if self.slider_value_action:
-            target_gb = self.target_vram_mb / 1024.0
-            self.slider_value_action.setText(f"Allocate {target_gb:.1f} GB VRAM")
+            target_gb = self.target_vram_mb * _MB_TO_GB
             can_apply_slider = (self.target_vram_mb != self.current_vram_mb)
+            self.slider_value_action.setText(f"Allocate {target_gb:.1f} GB VRAM")
             self.slider_value_action.setEnabled(self.is_operational and can_apply_slider)
 
     def _refresh_data_and_update_menu(self):
-        """Refreshes RAM values and updates the menu display. Does NOT reset target."""
+        """Queues a background VRAM read; the menu is updated in _apply_vram_values. Does NOT reset target."""
         print("[App] Refresh triggered...")
-        vram_changed = self.update_ram_values()
-        self.update_menu_items()
-        if vram_changed:
-             print("VRAM value changed since last check.")
+        self._request_vram_read(follow_target=False)
+
+    def _request_vram_read(self, follow_target):
+        """Dispatches a VRAM read to the worker thread unless one is already in flight."""
+        if self.total_ram_mb <= 0: return
+        self._follow_target_on_read = self._follow_target_on_read or follow_target
+        if self._vram_read_pending:
+            return # The in-flight read will deliver a fresh value
+        self._vram_read_pending = True
+        self.readVramRequested.emit(self.total_ram_mb)
+
+    def _on_menu_about_to_show(self):
+        """Starts polling while the menu is open.
+
+        No immediate refresh here: handle_tray_activation queues one right
+        after popping the menu up.
+        """
+        self.refresh_timer.start()
+
+    def _on_menu_about_to_hide(self):
+        """Stops polling once the menu is closed; nothing is visible to update."""
+        self.refresh_timer.stop()
+
+    def _on_app_state(self, state):
+        """Pauses the refresh timers while the application is hidden or suspended."""
+        if state == Qt.ApplicationState.ApplicationSuspended or state == Qt.ApplicationState.ApplicationHidden:
+            print("[App] Application hidden/suspended, pausing refresh timers.")
+            self.refresh_timer.stop()
+            self._watchdog_timer.stop()
+        else:
+            if not self._watchdog_timer.isActive():
+                self._watchdog_timer.start()
+            if self.menu.isVisible() and not self.refresh_timer.isActive():
+                self.refresh_timer.start()
 
     def handle_slider_value_changed(self, value_mb):
         """Updates ONLY the internal target VRAM state when slider moves (before release/snap)."""
         self.target_vram_mb = value_mb
-        if self.slider_value_action:
-            target_gb = self.target_vram_mb / 1024.0
-            self.slider_value_action.setText(f"Allocate {target_gb:.1f} GB VRAM")
-            can_apply_slider = (self.target_vram_mb != self.current_vram_mb)
-            self.slider_value_action.setEnabled(self.is_operational and can_apply_slider)
-        if self.ram_vram_bar_widget:
-            self.ram_vram_bar_widget.update_values(self.total_ram_mb, self.current_vram_mb, self.target_vram_mb)
+        # Coalesce bursts of slider events into at most one menu update per frame
+        if not self._slider_coalesce.isActive():
+            self._slider_coalesce.start()
 
 
     def handle_slider_snap_applied(self):
-        # ... (This method remains unchanged) ...
         print("[App] Slider snap applied (or release handled). Updating UI to final target.")
         final_snapped_value = self.slider_widget.get_value()
 
@@ -415,7 +640,8 @@ class MenuBarApp(QObject):
              print(f"Aligning internal target ({self.target_vram_mb}) with final slider value ({final_snapped_value}) after snap.")
              self.target_vram_mb = final_snapped_value
 
-        self.update_menu_items()
+        # Restart the coalescing timer so the release shares the frame's single menu update
+        self._slider_coalesce.start()
 
 
     def apply_slider_value_from_action(self):
@@ -443,7 +669,7 @@ class MenuBarApp(QObject):
              return
 
         clamped_mb = target_mb
-        # Clamp the requested value (unless it's 0 for default) before sending to set_vram_mb
+        # Clamp the requested value (unless it's 0 for default) before passing it to _start_set_vram
         if target_mb != 0:
              # Use the updated self.max_vram_mb which could be total RAM
              clamped_mb = max(self.min_vram_mb, min(target_mb, self.max_vram_mb))
@@ -451,9 +677,7 @@ class MenuBarApp(QObject):
                  print(f"Requested VRAM {target_mb}MB clamped to range [{self.min_vram_mb}-{self.max_vram_mb}]: {clamped_mb}MB")
         else:
             print("Requesting reset to system default VRAM (passing 0 to sysctl).")
-            calculated_default_mb = utils.calculate_default_vram_mb(self.total_ram_mb)
-            self.target_vram_mb = calculated_default_mb
-            self.update_menu_items()
+            self.target_vram_mb = self._calculated_default_mb
 
         # --- ADD WARNING CHECK ---
         if clamped_mb != 0: # Don't warn if setting to default
@@ -479,7 +703,7 @@ class MenuBarApp(QObject):
                     print("User cancelled VRAM set due to low system RAM warning.")
                     # Reset target VRAM back to current to reflect cancellation
                     self.target_vram_mb = self.current_vram_mb
-                    self.update_menu_items()
+                    self._schedule_menu_update()
                     return # Abort the setting process
                 else:
                     print("User confirmed VRAM set despite low system RAM warning.")
@@ -488,79 +712,169 @@ class MenuBarApp(QObject):
         # --- END WARNING CHECK ---
 
 
-        print(f"Calling utils.set_vram_mb with target: {clamped_mb}")
-        success, message = utils.set_vram_mb(clamped_mb)
+        self._start_set_vram(clamped_mb)
+
+    def _start_set_vram(self, clamped_mb):
+        """Runs the osascript apply in a QProcess so the event loop keeps running during the admin prompt."""
+        if self._vram_process is not None:
+            print(f"[App] A VRAM change is already in progress, ignoring request for {clamped_mb} MB.")
+            self._show_message("Info", "A VRAM change is already in progress.")
+            return
+
+        if utils.is_vram_unchanged(clamped_mb):
+            print(f"[App] VRAM limit already {clamped_mb} MB, skipping the admin prompt.")
+            self._on_set_vram_result(clamped_mb, True, "No change")
+            return
+
+        osascript_argv, error = utils.build_set_vram_command(clamped_mb)
+        if osascript_argv is None:
+            self._on_set_vram_result(clamped_mb, False, error)
+            return
+
+        print(f"Starting osascript with target: {clamped_mb}")
+        process = QProcess(self)
+        process.finished.connect(self._on_set_vram_finished)
+        process.errorOccurred.connect(self._on_set_vram_error)
+        self._vram_process = process
+        self._vram_process_mb = clamped_mb
+        process.start(osascript_argv[0], osascript_argv[1:]) # Exec osascript directly, no shell
+
+    def _take_vram_process(self):
+        """Detaches the finished osascript process and returns it (or None if already handled)."""
+        process = self._vram_process
+        self._vram_process = None
+        if process is not None:
+            process.deleteLater()
+        return process
+
+    def _on_set_vram_finished(self, exit_code, exit_status):
+        process = self._take_vram_process()
+        if process is None:
+            return
+        if exit_status != QProcess.ExitStatus.NormalExit:
+            exit_code = -1 # Crashed / killed, treat as a failure
+        stderr = bytes(process.readAllStandardError()).decode(errors="replace")
+        success, message = utils.handle_set_vram_result(self._vram_process_mb, exit_code, stderr)
+        if not success and message != utils.SET_VRAM_CANCELLED:
+            self._show_warning("VRAM Set Failed", message)
+        self._on_set_vram_result(self._vram_process_mb, success, message)
+
+    def _on_set_vram_error(self, error):
+        if error != QProcess.ProcessError.FailedToStart:
+            return # Other errors are followed by finished()
+        if self._take_vram_process() is None:
+            return
+        error_msg = f"An exception occurred trying to set VRAM: could not start osascript ({error})"
+        print(error_msg)
+        self._show_error("VRAM Set Error", error_msg)
+        self._on_set_vram_result(self._vram_process_mb, False, error_msg)
 
+    def _on_set_vram_result(self, clamped_mb, success, message):
         if success:
-            print(f"VRAM set command reported success via utils. Saving {clamped_mb} MB to settings.")
-            self.settings.setValue(SAVED_VRAM_KEY, clamped_mb)
-            self.settings.sync()
-            QTimer.singleShot(1500, self._refresh_data_and_update_menu)
+            if clamped_mb != self._cached_saved_vram:
+                print(f"VRAM set command reported success via utils. Saving {clamped_mb} MB to settings.")
+                self.saveVramRequested.emit(SAVED_VRAM_KEY, clamped_mb)
+                self._cached_saved_vram = clamped_mb
+            else:
+                print(f"VRAM set command reported success via utils. {clamped_mb} MB already saved.")
+            self._menu_dirty = True
+            self._post_apply_timer.start(config.POST_APPLY_REFRESH_MS)
         else:
             print(f"Failed to set VRAM or action cancelled. Message from utils: {message}")
             self.target_vram_mb = self.current_vram_mb
-            self.update_menu_items()
+            self._schedule_menu_update()
 
 
     # --- Tray Icon Interaction ---
     def handle_tray_activation(self, reason):
-        # ... (This method remains unchanged) ...
         if reason == QSystemTrayIcon.ActivationReason.Trigger or reason == QSystemTrayIcon.ActivationReason.Context:
+            if self.menu.isVisible():
+                return # Already open
+            # macOS can deliver Trigger and Context back to back for one click
+            now = time.monotonic()
+            if now - self._last_activation_ts < _ACTIVATION_DEBOUNCE_S:
+                return
+            self._last_activation_ts = now
+            click_pos = QCursor.pos() # Where the user clicked, before any menu work
             print(f"[App] Tray icon activated (Reason: {reason}), showing menu.")
-            vram_changed = self.update_ram_values()
+            # Pop up instantly with the last known values, then refresh in place
             self.target_vram_mb = self.current_vram_mb
             self.update_menu_items()
-            self.menu.popup(QCursor.pos())
+            self.menu.popup(click_pos)
+            QTimer.singleShot(0, self._async_refresh_then_update)
+
+    def _async_refresh_then_update(self):
+        """Re-reads VRAM on the worker thread after the menu is shown; see _apply_vram_values."""
+        if not self._menu_dirty and time.monotonic() - self._last_refresh_ts < config.MENU_STALE_AFTER_S:
+            return # Cached values are recent and nothing was applied since
+        self._request_vram_read(follow_target=True)
+
+    @pyqtSlot(int, int)
+    def _apply_vram_values(self, vram_mb, total_ram_mb):
+        """Receives a background VRAM read and updates the menu if the value changed."""
+        self._vram_read_pending = False
+        follow_target = self._follow_target_on_read
+        self._follow_target_on_read = False
+        if total_ram_mb != self.total_ram_mb:
+            return # Stale request
+        old_vram = self.current_vram_mb
+        if not self._store_vram_value(vram_mb):
+            # Target-dependent items are synced whenever the target changes,
+            # so with unchanged VRAM there is nothing new to show
+            return
+        print("VRAM value changed since last check.")
+        if follow_target and self.target_vram_mb == old_vram:
+            # The user hasn't moved the target yet, keep it following the current value
+            self.target_vram_mb = self.current_vram_mb
+        # Nobody can see the menu, skip the UI rebuild (it's redone before popup)
+        if not self.menu.isVisible():
+            return
+        self.update_menu_items()
 
 
     # --- Slot Methods for Actions ---
     def set_default_vram(self):
-        # ... (This method remains unchanged) ...
         print(f"[App] User requested setting VRAM to System Default.")
-        calculated_default_mb = utils.calculate_default_vram_mb(self.total_ram_mb)
-        self.target_vram_mb = calculated_default_mb
-        self.update_menu_items()
+        self.target_vram_mb = self._calculated_default_mb
+        self._sync_target_ui()
         self._set_vram_and_update(0) # Pass 0 to signify default
 
+    @pyqtSlot()
+    def _on_preset_triggered(self):
+        """Shared slot for all preset actions; the target MB is stored in the action's data."""
+        mb = self.sender().data()
+        self.set_preset_vram(int(mb))
+
     def set_preset_vram(self, value_mb):
-        # ... (This method remains unchanged) ...
         print(f"[App] User requested setting VRAM to Preset: {value_mb} MB")
         self.target_vram_mb = value_mb
-        self.update_menu_items()
+        self._sync_target_ui()
         self._set_vram_and_update(value_mb)
 
     # --- Startup Application Method ---
     def apply_saved_vram_on_startup(self):
-        # ... (This method remains unchanged from the previous version, but uses updated clamping) ...
         if not self.is_operational:
             print("[Startup Apply] Not operational, skipping saved VRAM check.")
             return
 
-        saved_vram_mb_variant = self.settings.value(SAVED_VRAM_KEY, defaultValue=None)
-        saved_vram_mb = None
-        if saved_vram_mb_variant is not None:
-            try:
-                saved_vram_mb = int(saved_vram_mb_variant)
-            except (ValueError, TypeError):
-                print(f"[Startup Apply] Warning: Could not parse saved VRAM value '{saved_vram_mb_variant}'. Ignoring.")
-                saved_vram_mb = None
+        saved_vram_mb = self._cached_saved_vram # Loaded once in __init__
 
         if saved_vram_mb is not None:
             print(f"[Startup Apply] Found saved VRAM setting: {saved_vram_mb} MB")
             print(f"[Startup Apply] Current VRAM setting is: {self.current_vram_mb} MB")
 
-            if saved_vram_mb != self.current_vram_mb:
-                print(f"[Startup Apply] Saved VRAM ({saved_vram_mb} MB) differs from current ({self.current_vram_mb} MB). Applying saved value.")
+            # Use the current valid range [min_vram_mb, max_vram_mb] for clamping
+            clamped_saved_vram = max(self.min_vram_mb, min(saved_vram_mb, self.max_vram_mb))
+            if clamped_saved_vram != saved_vram_mb:
+                 print(f"[Startup Apply] Warning: Clamping saved VRAM {saved_vram_mb}MB to current valid range [{self.min_vram_mb}-{self.max_vram_mb}]: {clamped_saved_vram}MB")
 
-                # Use the current valid range [min_vram_mb, max_vram_mb] for clamping
-                clamped_saved_vram = max(self.min_vram_mb, min(saved_vram_mb, self.max_vram_mb))
-                if clamped_saved_vram != saved_vram_mb:
-                     print(f"[Startup Apply] Warning: Clamping saved VRAM {saved_vram_mb}MB to current valid range [{self.min_vram_mb}-{self.max_vram_mb}]: {clamped_saved_vram}MB")
+            # Values within 1 MB are treated as equal (avoids a needless admin prompt)
+            if abs(clamped_saved_vram - self.current_vram_mb) > 1:
+                print(f"[Startup Apply] Saved VRAM ({clamped_saved_vram} MB) differs from current ({self.current_vram_mb} MB). Applying saved value.")
 
                 # Apply directly on startup (will prompt for password if needed)
                 # The warning check is now inside _set_vram_and_update, so it will trigger here too
                 self.target_vram_mb = clamped_saved_vram
-                self.update_menu_items()
                 self._set_vram_and_update(clamped_saved_vram) # This call now includes the warning logic
 
             else:
@@ -590,5 +904,16 @@ class MenuBarApp(QObject):
         """Stops timers, hides tray icon, and quits the application."""
         print("[App] Quitting application...")
         self.refresh_timer.stop()
+        self._watchdog_timer.stop()
+        self._post_apply_timer.stop()
+        process = self._take_vram_process() # Detached first so finished() reports nothing
+        if process is not None:
+            # Don't leave an osascript prompt behind once the app is gone
+            process.kill()
+            process.waitForFinished(1000)
+        # Queued writes run before the flush (same queue), then the flush syncs them to disk
+        self.flushSettingsRequested.emit()
+        self._worker_thread.quit()
+        self._worker_thread.wait()
         self.tray_icon.hide()
         self.app.quit()
\ No newline at end of file
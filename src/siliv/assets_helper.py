@@ -3,15 +3,21 @@
 
 import os
 import sys
+import functools
 
-def resource_path(relative_path):
-    """ Get absolute path to resource, works for dev and for PyInstaller """
+def _resolve_base_path():
+    """Returns the directory assets are resolved against (PyInstaller bundle or project root)."""
     try:
         # PyInstaller creates a temp folder and stores path in _MEIPASS
         # Adjust base path calculation if assets are bundled differently
-        base_path = getattr(sys, '_MEIPASS', os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+        return getattr(sys, '_MEIPASS', os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
     except Exception:
         # Fallback for safety, assuming script is run from project root in dev
-        base_path = os.path.abspath(".")
+        return os.path.abspath(".")
+
+_BASE_PATH = _resolve_base_path() # Fixed for the lifetime of the process
 
-    return os.path.join(base_path, relative_path)
\ No newline at end of file
+@functools.lru_cache(maxsize=None)
+def resource_path(relative_path):
+    """ Get absolute path to resource, works for dev and for PyInstaller """
+    return os.path.join(_BASE_PATH, relative_path)
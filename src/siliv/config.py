@@ -18,4 +18,7 @@ SLIDER_TICK_INTERVAL_MB = 5120 # Tick interval for slider (5GB)
 SLIDER_SINGLE_STEP_MB = 1024   # Single step for slider (1GB)
 
 # --- Refresh Rate ---
-REFRESH_INTERVAL_MS = 30000 # 30 seconds
\ No newline at end of file
+REFRESH_INTERVAL_MS = 2000           # 2 seconds, only polled while the menu is open
+POST_APPLY_REFRESH_MS = 2000         # Delay before re-reading VRAM after a successful apply
+WATCHDOG_INTERVAL_MS = 5 * 60 * 1000 # 5 minutes, background drift detection while hidden
+MENU_STALE_AFTER_S = 10              # Re-read on menu open if the last read is older than this
\ No newline at end of file
@@ -4,18 +4,21 @@
 import sys
 import os
 # Use PyQt6 imports
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtGui import QIcon
 
 # Local Imports
-from siliv.app import MenuBarApp
-from siliv.ui.styles import DARK_MENU_STYLESHEET
+# (siliv.app and siliv.ui.styles are imported in main(), after QApplication exists)
 from siliv.assets_helper import resource_path
 
 def main():
     """Main function to initialize and run the application."""
     app = QApplication(sys.argv)
 
+    # Deferred so the app/widget modules load only once Qt is up
+    from siliv.app import MenuBarApp
+    from siliv.ui.styles import DARK_MENU_STYLESHEET
+
     # Apply the dark stylesheet globally
     app.setStyleSheet(DARK_MENU_STYLESHEET)
 
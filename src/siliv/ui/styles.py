@@ -1,6 +1,8 @@
 # src/siliv/ui/styles.py
 # Stylesheet for the Siliv application menu.
 
+import re
+
 # --- Adjusted Dark Theme Stylesheet (Based on unnamed.png) ---
 # Aiming for the darker grey look with specific text colors
 DARK_MENU_STYLESHEET = """
@@ -71,4 +73,9 @@ DARK_MENU_STYLESHEET = """
          margin-bottom: 2px; /* Add margin below ticks */
     }
     /* --- End Styling for Slider Widget --- */
-"""
\ No newline at end of file
+"""
+
+# --- Minify once at import ---
+# Comments and indentation are for readers only; hand Qt's CSS parser the compact form
+DARK_MENU_STYLESHEET = re.sub(r"/\*.*?\*/", "", DARK_MENU_STYLESHEET, flags=re.S)
+DARK_MENU_STYLESHEET = re.sub(r"\s+", " ", DARK_MENU_STYLESHEET).strip()
@@ -1,17 +1,20 @@
 # src/siliv/ui/widgets.py
 # Custom PyQt6 widgets for the Siliv application UI.
 
-import math
 import sys
+import array
+from bisect import bisect_left
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSlider, QFrame, QSizePolicy, QMessageBox # Import QMessageBox here if needed, but better in app.py
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QRectF
+from PyQt6.QtCore import Qt, pyqtSignal, QRect, QRectF
 from PyQt6.QtGui import QPainter, QBrush, QColor, QPainterPath, QPen
 
 # Import config for colors and constants
 from siliv import config
 
+_MB_TO_GB = 1 / 1024.0
+
 # --- Custom Widget for RAM/VRAM Bar ---
 # BarDisplayWidget remains unchanged...
 class BarDisplayWidget(QWidget):
@@ -24,11 +27,23 @@ class BarDisplayWidget(QWidget):
         self.bar_height = 14
         self.setMinimumHeight(self.bar_height)
         self.setMaximumHeight(self.bar_height)
+        # Brushes/clip path reused across repaints instead of rebuilt per paintEvent
+        self._vram_brush = QBrush(config.VRAM_COLOR)
+        self._faded_brush = QBrush(config.FADED_VRAM_COLOR)
+        self._reserved_brush = QBrush(config.RESERVED_RAM_COLOR)
+        self._clip_path = None
+        self._clip_path_size = None # QSize the clip path was built for
 
     def set_values(self, total_mb, current_vram_mb, target_vram_mb):
-        self.total_mb = max(1, total_mb)
-        self.current_vram_mb = max(0, min(current_vram_mb, self.total_mb))
-        self.target_vram_mb = max(0, min(target_vram_mb, self.total_mb))
+        # Inline clamps (called per slider step; avoids the min/max builtin calls)
+        if total_mb < 1: total_mb = 1
+        current_vram_mb = 0 if current_vram_mb < 0 else (total_mb if current_vram_mb > total_mb else current_vram_mb)
+        target_vram_mb = 0 if target_vram_mb < 0 else (total_mb if target_vram_mb > total_mb else target_vram_mb)
+        if (total_mb, current_vram_mb, target_vram_mb) == (self.total_mb, self.current_vram_mb, self.target_vram_mb):
+            return # Nothing to redraw
+        self.total_mb = total_mb
+        self.current_vram_mb = current_vram_mb
+        self.target_vram_mb = target_vram_mb
         self.update()
 
     def paintEvent(self, event):
@@ -40,29 +55,33 @@ class BarDisplayWidget(QWidget):
         if self.total_mb <= 0 or total_width <= 0:
             painter.end()
             return
-        path = QPainterPath()
-        path.addRoundedRect(QRectF(0.0, 0.0, total_width, bar_height), radius, radius)
-        painter.setClipPath(path)
+        size = self.size()
+        if size != self._clip_path_size:
+            path = QPainterPath()
+            path.addRoundedRect(QRectF(0.0, 0.0, total_width, bar_height), radius, radius)
+            self._clip_path = path
+            self._clip_path_size = size
+        painter.setClipPath(self._clip_path) # Antialiased clip for the rounded ends
+        # The fills are pixel-aligned rects inside that clip; AA only slows them down
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
         painter.setPen(Qt.PenStyle.NoPen)
-        target_vram_pos = total_width * (self.target_vram_mb / self.total_mb)
-        current_vram_pos = total_width * (self.current_vram_mb / self.total_mb)
+        # Whole-pixel segment edges: integer fillRect, and adjacent segments never overlap or gap
+        width = self.width()
+        height = self.height()
+        target_vram_pos = width * self.target_vram_mb // self.total_mb
+        current_vram_pos = width * self.current_vram_mb // self.total_mb
+        if target_vram_pos > 0:
+            painter.fillRect(QRect(0, 0, target_vram_pos, height), self._vram_brush)
         if self.target_vram_mb < self.current_vram_mb:
-            diff_pos = current_vram_pos - target_vram_pos
-            if target_vram_pos > 0:
-                painter.fillRect(QRectF(0.0, 0.0, target_vram_pos, bar_height), config.VRAM_COLOR)
-            if diff_pos > 0:
-                painter.fillRect(QRectF(target_vram_pos, 0.0, diff_pos, bar_height), config.FADED_VRAM_COLOR)
+            diff_width = current_vram_pos - target_vram_pos
+            if diff_width > 0:
+                painter.fillRect(QRect(target_vram_pos, 0, diff_width, height), self._faded_brush)
             reserved_start_pos = current_vram_pos
-            reserved_width = total_width - reserved_start_pos
-            if reserved_width > 0:
-                painter.fillRect(QRectF(reserved_start_pos, 0.0, reserved_width, bar_height), config.RESERVED_RAM_COLOR)
         else:
             reserved_start_pos = target_vram_pos
-            reserved_width = total_width - reserved_start_pos
-            if target_vram_pos > 0:
-                painter.fillRect(QRectF(0.0, 0.0, target_vram_pos, bar_height), config.VRAM_COLOR)
-            if reserved_width > 0:
-                painter.fillRect(QRectF(reserved_start_pos, 0.0, reserved_width, bar_height), config.RESERVED_RAM_COLOR)
+        reserved_width = width - reserved_start_pos
+        if reserved_width > 0:
+            painter.fillRect(QRect(reserved_start_pos, 0, reserved_width, height), self._reserved_brush)
         painter.end()
 
 # RamVramBarWidget remains unchanged...
@@ -73,6 +92,8 @@ class RamVramBarWidget(QWidget):
         self.bar_display = BarDisplayWidget(self)
         self.reserved_label = QLabel("Reserved: --- GB")
         self.vram_label = QLabel("VRAM: --- GB")
+        self._last_reserved_text = None # Last text set on each label (setText re-lays out even if equal)
+        self._last_vram_text = None
         label_style = f"color: {config.TEXT_COLOR_DIM}; font-size: 10pt; background-color: transparent;"
         self.reserved_label.setStyleSheet(label_style)
         self.vram_label.setStyleSheet(label_style)
@@ -94,10 +115,16 @@ class RamVramBarWidget(QWidget):
         self.bar_display.set_values(total_mb, current_vram_mb, target_vram_mb)
         # Calculate reserved based on TARGET vram for the labels
         target_reserved_mb = max(0, total_mb - target_vram_mb)
-        target_reserved_gb = target_reserved_mb / 1024.0
-        target_vram_gb = target_vram_mb / 1024.0
-        self.reserved_label.setText(f"Reserved: {target_reserved_gb:.1f} GB")
-        self.vram_label.setText(f"VRAM: {target_vram_gb:.1f} GB")
+        target_reserved_gb = target_reserved_mb * _MB_TO_GB
+        target_vram_gb = target_vram_mb * _MB_TO_GB
+        reserved_text = f"Reserved: {target_reserved_gb:.1f} GB"
+        vram_text = f"VRAM: {target_vram_gb:.1f} GB"
+        if reserved_text != self._last_reserved_text:
+            self.reserved_label.setText(reserved_text)
+            self._last_reserved_text = reserved_text
+        if vram_text != self._last_vram_text:
+            self.vram_label.setText(vram_text)
+            self._last_vram_text = vram_text
 
 
 # --- Slider Widget with Mapped Ticks ---
@@ -114,8 +141,9 @@ class SliderWidget(QWidget):
         self._actual_min_mb = min_val
         self._actual_max_mb = max_val # Will be updated by set_range if needed
         self._num_ticks = 1
-        self._tick_to_mb_map = {}
-        self._mb_to_tick_map = {}
+        self._tick_to_mb_list = [] # MB value of tick i+1 (ticks are dense 1..N)
+        self._fast_tick_to_mb = self._tick_to_mb_list.__getitem__ # Bound lookup for the drag path
+        self._sorted_mb = array.array('i') # MB value of tick i+1, ascending
 
         layout = QHBoxLayout()
         layout.setContentsMargins(10, 3, 10, 3)
@@ -139,8 +167,6 @@ class SliderWidget(QWidget):
 
     def _generate_mapping(self, min_mb, max_mb):
         """Generates the mapping between tick indices (1..N) and MB values."""
-        self._tick_to_mb_map.clear()
-        self._mb_to_tick_map.clear()
         points_mb = []
 
         # Tick 1: Usually 1GB (config.SLIDER_MIN_MB)
@@ -153,17 +179,10 @@ class SliderWidget(QWidget):
 
         # Ticks 2 to N-1: 5GB multiples
         five_gb_interval = 5 * 1024
-        # Start checking from the first 5GB multiple *after* the first point
-        start_5gb = five_gb_interval * math.ceil( (points_mb[0] if points_mb else min_mb) / five_gb_interval)
-        if start_5gb <= (points_mb[0] if points_mb else min_mb): # Adjust if first point is already a multiple
-             start_5gb += five_gb_interval
-
-        current_5gb_multiple = start_5gb
-        while current_5gb_multiple < max_mb: # Use < max_mb to avoid duplicating max value later
-            if current_5gb_multiple >= min_mb:
-                 if not points_mb or current_5gb_multiple > points_mb[-1]:
-                     points_mb.append(current_5gb_multiple)
-            current_5gb_multiple += five_gb_interval
+        # Start from the first 5GB multiple strictly *after* the first point (which is >= min_mb),
+        # so every multiple below max_mb is in range and ascending
+        start_5gb = ((points_mb[0] if points_mb else min_mb) // five_gb_interval + 1) * five_gb_interval
+        points_mb.extend(range(start_5gb, max_mb, five_gb_interval)) # Stop < max_mb to avoid duplicating max value later
 
         # Tick N: Actual max value (if > last point added and >= min_mb)
         # Ensures the maximum possible value is always an option
@@ -177,46 +196,36 @@ class SliderWidget(QWidget):
 
         # --- Create the maps ---
         self._num_ticks = len(points_mb)
-        for i, mb_value in enumerate(points_mb):
-            tick_index = i + 1
-            self._tick_to_mb_map[tick_index] = mb_value
-            if mb_value not in self._mb_to_tick_map:
-                self._mb_to_tick_map[mb_value] = tick_index
+        self._tick_to_mb_list = points_mb
+        self._fast_tick_to_mb = points_mb.__getitem__
+        self._sorted_mb = array.array('i', points_mb) # Strictly ascending by construction, for bisect
 
         # print(f"Num Ticks (N): {self._num_ticks}")
-        # print(f"Tick->MB Map: {self._tick_to_mb_map}")
-        # print(f"MB->Tick Map: {self._mb_to_tick_map}")
+        # print(f"Tick->MB List: {self._tick_to_mb_list}")
 
 
     def _map_tick_to_mb(self, tick_index):
         """Maps a tick index (1 to N) to the corresponding VRAM MB value."""
+        if not self._tick_to_mb_list: return self._actual_min_mb # No ticks generated
         # Ensure tick_index is valid before lookup
         valid_tick_index = max(1, min(tick_index, self._num_ticks))
-        # Use the valid index, default to min_mb if map somehow fails
-        return self._tick_to_mb_map.get(valid_tick_index, self._actual_min_mb)
+        return self._tick_to_mb_list[valid_tick_index - 1]
 
 
     def _map_mb_to_tick(self, mb_value):
         """Finds the tick index closest to the given VRAM MB value."""
-        if not self._tick_to_mb_map: return 1
-
-        closest_tick = 1
-        # Handle case where only one tick exists
-        if self._num_ticks == 1: return 1
-
-        # Initialize min_diff with the difference to the first tick's value
-        first_tick_val = self._tick_to_mb_map.get(1, self._actual_min_mb)
-        min_diff = abs(mb_value - first_tick_val)
-
-        for tick_index, mapped_mb in self._tick_to_mb_map.items():
-            diff = abs(mb_value - mapped_mb)
-            if diff < min_diff:
-                min_diff = diff
-                closest_tick = tick_index
-            elif diff == min_diff: # Prefer lower tick on ties
-                closest_tick = min(closest_tick, tick_index)
-
-        return closest_tick
+        points = self._sorted_mb
+        num_points = len(points)
+        if num_points <= 1: return 1
+
+        # Binary search for the first tick >= mb_value (ticks are 1-based)
+        i = bisect_left(points, mb_value)
+        if i == 0: return 1
+        if i == num_points: return num_points
+        # points[i - 1] < mb_value <= points[i]; prefer the lower tick on ties
+        if points[i] - mb_value < mb_value - points[i - 1]:
+            return i + 1
+        return i
 
     def set_range(self, min_val, max_val):
         """
@@ -248,10 +257,12 @@ class SliderWidget(QWidget):
         """
         if not self.isEnabled() or self._num_ticks <= 0: return # Don't set if disabled or no ticks
 
-        self.slider.blockSignals(True)
         tick_index = self._map_mb_to_tick(value_mb)
         # Clamp tick_index to the slider's actual range (1 to N)
         clamped_tick_index = max(self.slider.minimum(), min(tick_index, self.slider.maximum()))
+        if self.slider.value() == clamped_tick_index: return # Already there, skip the Qt round-trip
+
+        self.slider.blockSignals(True)
         self.slider.setValue(clamped_tick_index)
         # print(f"Set MB {value_mb} -> Tick {clamped_tick_index}")
         self.slider.blockSignals(False)
@@ -270,6 +281,10 @@ class SliderWidget(QWidget):
         Handles the slider's internal valueChanged signal (which emits tick index).
         Maps the tick index to MB and emits the public valueChanged signal.
         """
-        mapped_mb_value = self._map_tick_to_mb(tick_index)
+        # QSlider keeps tick_index within 1..N, so index the list directly
+        try:
+            mapped_mb_value = self._fast_tick_to_mb(tick_index - 1)
+        except IndexError: # No ticks generated
+            mapped_mb_value = self._map_tick_to_mb(tick_index)
         # print(f"Internal change: Tick {tick_index} -> MB {mapped_mb_value}")
         self.valueChanged.emit(mapped_mb_value) # Emit the MB value
\ No newline at end of file
@@ -5,106 +5,209 @@ import sys
 import subprocess
 import platform
 import os
-from PyQt6.QtWidgets import QMessageBox # For showing errors related to util failures
+import time
+import ctypes
+import functools
+from siliv import config
 
-def run_command(command):
-    """Executes a shell command and returns its output."""
+IS_DARWIN = sys.platform == "darwin" # Evaluated once; cheaper than platform.system() per call
+
+# --- Native sysctl access (avoids a fork+exec of /usr/sbin/sysctl per read) ---
+_libc = None
+if IS_DARWIN:
+    try:
+        # libSystem is always present (dyld shared cache), no library search needed
+        _libc = ctypes.CDLL("/usr/lib/libSystem.B.dylib", use_errno=True)
+        _libc.sysctlbyname.argtypes = [ctypes.c_char_p, ctypes.c_void_p, ctypes.POINTER(ctypes.c_size_t), ctypes.c_void_p, ctypes.c_size_t]
+        _libc.sysctlbyname.restype = ctypes.c_int
+    except (OSError, AttributeError) as e:
+        print(f"Warning: sysctlbyname unavailable, falling back to the sysctl command: {e}")
+        _libc = None
+
+# --- Current VRAM read cache ---
+_VRAM_CACHE_TTL_S = 0.5 # Repeated reads within one menu build reuse the last value
+_vram_cache = None      # (monotonic timestamp, raw limit MB)
+
+def _sysctl_u64(name):
+    """Reads an integer sysctl (name as bytes) via sysctlbyname(3). Returns None on failure."""
+    if _libc is None:
+        return None
+    # 4-byte sysctls fill the low half of the zeroed buffer (little-endian on Apple Silicon)
+    value = ctypes.c_uint64(0)
+    size = ctypes.c_size_t(ctypes.sizeof(value))
+    if _libc.sysctlbyname(name, ctypes.byref(value), ctypes.byref(size), None, 0) != 0:
+        return None
+    return value.value
+
+# Sysctls that cannot change while the machine is booted; read once per process
+_IMMUTABLE_SYSCTLS = frozenset((b"hw.memsize", b"hw.pagesize"))
+_immutable_sysctl_values = {}
+
+def sysctl_batch(names):
+    """Reads several integer sysctls (names as bytes) in one pass.
+
+    Immutable values (see _IMMUTABLE_SYSCTLS) are served from a process-wide
+    cache after the first read; everything else is re-queried.
+
+    Returns:
+        dict: name -> int, names that could not be read are omitted
+    """
+    values = {}
+    for name in names:
+        value = _immutable_sysctl_values.get(name)
+        if value is None:
+            value = _sysctl_u64(name)
+            if value is None:
+                continue
+            if name in _IMMUTABLE_SYSCTLS:
+                _immutable_sysctl_values[name] = value
+        values[name] = value
+    return values
+
+def run_command(args):
+    """Executes a /usr/sbin command given as an argv list (no shell) and returns its stripped output as bytes.
+
+    Output is left undecoded: callers only parse integers, and int() accepts bytes.
+    """
+    command = " ".join(args) # For log messages
     try:
-        # Use sysctl path directly
-        result = subprocess.run(f"/usr/sbin/{command}", capture_output=True, text=True, check=True, shell=True)
+        # Use sysctl path directly; no stdin, so the child never touches a tty
+        result = subprocess.run(["/usr/sbin/" + args[0], *args[1:]], stdin=subprocess.DEVNULL, capture_output=True, check=True)
         return result.stdout.strip()
     except subprocess.CalledProcessError as e:
         # Ignore "unknown oid" errors which can happen during version checks
-        if "unknown oid" not in e.stderr.lower():
-            print(f"Error running command '{command}': {e}\nStderr: {e.stderr}")
+        if b"unknown oid" not in e.stderr.lower():
+            print(f"Error running command '{command}': {e}\nStderr: {e.stderr.decode(errors='replace')}")
         return None
     except FileNotFoundError:
-        print(f"Error: Command '/usr/sbin/sysctl' not found.")
+        print(f"Error: Command '/usr/sbin/{args[0]}' not found.")
         return None
     except Exception as e:
         print(f"An unexpected error occurred running command '{command}': {e}")
         return None
 
+@functools.lru_cache(maxsize=1)
 def get_macos_version():
-    """Gets the major macOS version number."""
-    if platform.system() != "Darwin":
+    """Gets the major macOS version number (cached, it can't change while running)."""
+    if not IS_DARWIN:
         return 0
     try:
-        # platform.mac_ver() returns ('14.4.1', ('', '', ''), 'arm64') on Sonoma ARM
+        # platform.mac_ver() returns ('14.4.1', ('', '', ''), 'arm64') on Sonoma ARM,
+        # but can return '' in some frozen builds; ask sw_vers then
         version_str = platform.mac_ver()[0]
-        major_version = int(version_str.split('.')[0])
+        if not version_str:
+            version_str = subprocess.run(["/usr/bin/sw_vers", "-productVersion"], capture_output=True, text=True, check=True).stdout.strip()
+        major_version = int(version_str.split('.', 1)[0])
         return major_version
     except Exception as e:
         print(f"Could not determine macOS version: {e}")
         return 0
 
+# VRAM sysctl keys: Sonoma (14) and later, including Sequoia (assuming key
+# stays same for now), vs. Ventura (13)
+_WIRED_LIMIT_KEY_NEW = "iogpu.wired_limit_mb"
+_WIRED_LIMIT_KEY_OLD = "debug.iogpu.wired_limit"
+
+@functools.lru_cache(maxsize=1)
 def get_vram_sysctl_key():
-    """Returns the correct sysctl key based on macOS version."""
+    """Returns the correct sysctl key based on macOS version (cached)."""
     major_version = get_macos_version()
-    if major_version >= 15: # Sequoia and later (assuming key stays same for now)
-        return "iogpu.wired_limit_mb"
-    elif major_version == 14: # Sonoma
-        return "iogpu.wired_limit_mb"
-    elif major_version == 13: # Ventura
-        return "debug.iogpu.wired_limit"
-    else:
-        # Older versions might use different keys or not support it
-        print(f"Warning: Unsupported macOS version {major_version} for VRAM control.")
-        return None
+    if major_version >= 14:
+        return _WIRED_LIMIT_KEY_NEW
+    if major_version == 13:
+        return _WIRED_LIMIT_KEY_OLD
+    # Older versions might use different keys or not support it
+    print(f"Warning: Unsupported macOS version {major_version} for VRAM control.")
+    return None
 
+@functools.lru_cache(maxsize=1)
 def get_total_ram_mb():
-    """Gets total system RAM in MB."""
-    if platform.system() != "Darwin":
+    """Gets total system RAM in MB (cached, hw.memsize never changes at runtime)."""
+    if not IS_DARWIN:
         return None
-    output = run_command("sysctl -n hw.memsize")
+    ram_bytes = sysctl_batch((b"hw.memsize",)).get(b"hw.memsize")
+    if ram_bytes is not None:
+        return ram_bytes >> 20 # bytes -> MB
+    output = run_command(["sysctl", "-n", "hw.memsize"])
     if output:
         try:
             ram_bytes = int(output)
-            return int(ram_bytes / (1024 * 1024))
+            return ram_bytes >> 20 # bytes -> MB
         except ValueError:
-            print(f"Could not parse RAM size: {output}")
+            print(f"Could not parse RAM size: {output.decode(errors='replace')}")
     return None
 
+@functools.lru_cache(maxsize=1)
+def get_static_sysinfo():
+    """Returns (total_ram_mb, vram_key, macos_major) for this machine.
+
+    These never change while the app is running, so the result is cached
+    and the underlying lookups run only once.
+    """
+    macos_major = get_macos_version()
+    vram_key = get_vram_sysctl_key()
+    total_ram_mb = get_total_ram_mb()
+    return total_ram_mb, vram_key, macos_major
+
+@functools.lru_cache(maxsize=4)
 def calculate_default_vram_mb(total_ram_mb):
     """Calculates the default macOS VRAM allocation based on total RAM."""
     if not total_ram_mb or total_ram_mb <= 0:
         return 0 # Cannot calculate without total RAM
 
-    # Apple's typical default logic (approximated)
-    total_ram_gb = total_ram_mb / 1024.0
-    if total_ram_gb <= 36:
+    # Apple's typical default logic (approximated), in integer MB arithmetic
+    total_ram_mb = int(total_ram_mb)
+    if total_ram_mb <= 36 * 1024:
         # Typically 2/3 for systems up to 36GB? (This is a common heuristic)
-        default_vram_mb = int(total_ram_mb * (2/3))
+        default_vram_mb = total_ram_mb * 2 // 3
     else:
         # Typically 3/4 for systems above 36GB? (Another heuristic)
-        default_vram_mb = int(total_ram_mb * (3/4))
+        default_vram_mb = total_ram_mb * 3 // 4
 
     # Ensure it's not negative
     return max(0, default_vram_mb)
 
+def _read_vram_limit_mb(vram_key):
+    """Reads the raw VRAM limit sysctl. Returns None if it can't be read (0 means system default)."""
+    value = _sysctl_u64(vram_key.encode())
+    if value is not None:
+        return value
+
+    output = run_command(["sysctl", "-n", vram_key])
+    if output:
+        try:
+            return int(output)
+        except ValueError:
+            print(f"Could not parse VRAM size from {vram_key}: {output.decode(errors='replace')}")
+    return None # Indicate we couldn't read it
+
+def _cached_vram_limit_mb(vram_key):
+    """Returns the raw VRAM limit sysctl (None if unreadable), reusing a read younger than _VRAM_CACHE_TTL_S."""
+    global _vram_cache
+    now = time.monotonic()
+    if _vram_cache is not None and now - _vram_cache[0] < _VRAM_CACHE_TTL_S:
+        return _vram_cache[1]
+    current_limit_mb = _read_vram_limit_mb(vram_key)
+    if current_limit_mb is not None: # Failed reads are retried, not cached
+        _vram_cache = (now, current_limit_mb)
+    return current_limit_mb
+
 def get_current_vram_mb(total_ram_mb):
     """Gets the currently effective VRAM limit in MB."""
-    if platform.system() != "Darwin":
+    if not IS_DARWIN:
         return 0 # Not on macOS
 
-    vram_key = get_vram_sysctl_key()
+    vram_key = get_static_sysinfo()[1]
     if vram_key is None:
         print("Cannot get VRAM: No valid sysctl key found for this macOS version.")
         # Attempt to return a calculated default as a fallback guess
         return calculate_default_vram_mb(total_ram_mb)
 
-    output = run_command(f"sysctl -n {vram_key}")
-    current_limit_mb = 0
-    if output:
-        try:
-            current_limit_mb = int(output)
-        except ValueError:
-            print(f"Could not parse VRAM size from {vram_key}: {output}")
-            # Fallback if parsing fails but key exists
-            current_limit_mb = 0 # Indicate we couldn't read it
+    current_limit_mb = _cached_vram_limit_mb(vram_key)
 
     # If the sysctl key returns 0, it usually means macOS is using its internal default
-    if current_limit_mb == 0:
+    # (an unreadable key falls back to the same calculated default)
+    if not current_limit_mb:
         default_vram_mb = calculate_default_vram_mb(total_ram_mb)
         # print(f"Current VRAM key '{vram_key}' returned 0, using calculated default: {default_vram_mb} MB")
         return default_vram_mb
@@ -112,63 +215,125 @@ def get_current_vram_mb(total_ram_mb):
         # print(f"Current VRAM read from '{vram_key}': {current_limit_mb} MB")
         return current_limit_mb
 
-def set_vram_mb(value_mb):
-    """Sets the VRAM limit using the appropriate sysctl key via osascript.
+def read_sysctl_keys(keys):
+    """Reads several sysctls with a single `sysctl -n` run (fallback when sysctlbyname is unavailable).
 
     Returns:
-        tuple: (bool: success, str: message)
+        list: one raw output line (bytes, undecoded) per key, in order, or None on failure
+    """
+    output = run_command(["sysctl", "-n", *keys])
+    if output is None:
+        return None
+    lines = output.splitlines()
+    return lines if len(lines) == len(keys) else None
+
+def get_system_state():
+    """Returns (total_ram_mb, current_vram_mb) for the initial load.
+
+    Without sysctlbyname, both values come from one `sysctl -n` run instead of
+    two; the results seed the caches the individual getters read from.
     """
-    if platform.system() != "Darwin":
-        return False, "Not running on macOS"
+    if not IS_DARWIN:
+        return None, 0
 
     vram_key = get_vram_sysctl_key()
+    if _libc is None and vram_key is not None and b"hw.memsize" not in _immutable_sysctl_values:
+        lines = read_sysctl_keys(["hw.memsize", vram_key])
+        if lines:
+            try:
+                ram_bytes, vram_limit_mb = int(lines[0]), int(lines[1])
+            except ValueError:
+                print(f"Could not parse batched sysctl output: {b' | '.join(lines).decode(errors='replace')}")
+            else:
+                global _vram_cache
+                _immutable_sysctl_values[b"hw.memsize"] = ram_bytes
+                _vram_cache = (time.monotonic(), vram_limit_mb)
+
+    total_ram_mb = get_static_sysinfo()[0]
+    return total_ram_mb, get_current_vram_mb(total_ram_mb) if total_ram_mb else 0
+
+def is_vram_unchanged(value_mb):
+    """True if the VRAM limit sysctl already holds value_mb (0 = system default).
+
+    Lets callers skip the osascript admin prompt for a no-op apply.
+    """
+    if not IS_DARWIN:
+        return False
+    vram_key = get_static_sysinfo()[1]
+    if vram_key is None:
+        return False
+    try:
+        target_value = int(value_mb)
+    except (ValueError, TypeError):
+        return False
+    current_limit_mb = _cached_vram_limit_mb(vram_key)
+    if current_limit_mb is None:
+        return False # Unknown, so let the write go ahead
+    return current_limit_mb == target_value
+
+def invalidate_vram_cache():
+    """Drops the cached VRAM read so the next get_current_vram_mb hits sysctl."""
+    global _vram_cache
+    _vram_cache = None
+
+def build_set_vram_command(value_mb):
+    """Builds the osascript argv that sets the VRAM limit with administrator privileges.
+
+    Returns:
+        tuple: (list or None: argv, str: error message if the command could not be built)
+    """
+    if not IS_DARWIN:
+        return None, "Not running on macOS"
+
+    vram_key = get_static_sysinfo()[1]
     if vram_key is None:
-        return False, "Cannot set VRAM on this macOS version."
+        return None, "Cannot set VRAM on this macOS version."
 
     try:
         target_value = int(value_mb)
     except ValueError:
-        return False, f"Invalid VRAM value: {value_mb}"
+        return None, f"Invalid VRAM value: {value_mb}"
 
-    # Construct the shell command to be run with administrator privileges
+    # 0 resets to the system default; anything else must be a sane allocation
+    total_ram_mb = get_static_sysinfo()[0]
+    if target_value != 0 and (target_value < config.SLIDER_MIN_MB or (total_ram_mb and target_value > total_ram_mb)):
+        return None, f"VRAM value {target_value} MB is outside the allowed range [{config.SLIDER_MIN_MB}-{total_ram_mb}] MB."
+
+    # Construct the shell command to be run with administrator privileges.
+    # The key comes from our own table and the value is an int, so there is
+    # nothing to escape inside the AppleScript string literal.
     command_to_run = f'/usr/sbin/sysctl -w {vram_key}={target_value}'
+    script = f'do shell script "{command_to_run}" with administrator privileges'
 
-    # Escape the command for embedding within the AppleScript string
-    escaped_command = command_to_run.replace('"', '\\"')
+    print(f"Attempting to set {vram_key} to {target_value} via osascript...")
+    return ["/usr/bin/osascript", "-e", script], ""
 
-    # Construct the full osascript command
-    osascript_cmd = f"osascript -e 'do shell script \"{escaped_command}\" with administrator privileges'"
+SET_VRAM_CANCELLED = "Cancelled by user." # Message returned when the admin prompt is dismissed
 
-    print(f"Attempting to set {vram_key} to {target_value} via osascript...")
+def handle_set_vram_result(value_mb, returncode, stderr):
+    """Interprets the exit status of the osascript command built by build_set_vram_command.
 
-    try:
-        # Run the osascript command
-        process = subprocess.Popen(osascript_cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        stdout, stderr = process.communicate()
-
-        # Check the result
-        if process.returncode == 0:
-            print(f"Successfully set {vram_key} to {target_value}.")
-            return True, "Success"
-        else:
-            # Handle potential errors, including user cancellation
-            error_message = stderr.strip()
-            if "User canceled" in error_message or "(-128)" in error_message:
-                 print("VRAM setting canceled by user.")
-                 return False, "Cancelled by user."
-            else:
-                print(f"Failed to set {vram_key}. Return code: {process.returncode}, Stderr: {error_message}")
-                # Provide a more user-friendly error if possible
-                if "operation not permitted" in error_message.lower():
-                    friendly_error = "Failed to set VRAM: Operation not permitted.\nEnsure you have administrator rights."
-                else:
-                    friendly_error = f"Failed to set VRAM.\nError: {error_message}"
-                # Display error to user via MessageBox
-                QMessageBox.warning(None, "VRAM Set Failed", friendly_error)
-                return False, friendly_error
+    Shows no UI; callers decide how to surface a failure message.
 
-    except Exception as e:
-        error_msg = f"An exception occurred trying to set VRAM: {e}"
-        print(error_msg)
-        QMessageBox.critical(None, "VRAM Set Error", error_msg)
-        return False, error_msg
\ No newline at end of file
+    Returns:
+        tuple: (bool: success, str: message)
+    """
+    vram_key = get_static_sysinfo()[1]
+    if returncode == 0:
+        print(f"Successfully set {vram_key} to {value_mb}.")
+        invalidate_vram_cache() # The cached read now predates the write
+        return True, "Success"
+
+    # Handle potential errors, including user cancellation
+    error_message = stderr.strip()
+    if "User canceled" in error_message or "(-128)" in error_message:
+        print("VRAM setting canceled by user.")
+        return False, SET_VRAM_CANCELLED
+
+    print(f"Failed to set {vram_key}. Return code: {returncode}, Stderr: {error_message}")
+    # Provide a more user-friendly error if possible
+    if "operation not permitted" in error_message.lower():
+        friendly_error = "Failed to set VRAM: Operation not permitted.\nEnsure you have administrator rights."
+    else:
+        friendly_error = f"Failed to set VRAM.\nError: {error_message}"
+    return False, friendly_error